@@ -0,0 +1,39 @@
+try:
+    from numba import njit, uint32, uint64, int32
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+# Frames up to this many bits (data plus CRC) fit in the kernel's register.
+KERNEL_MAX_BITS = 63
+
+def _crc_bits(data, poly, data_len, poly_len):
+    """
+    Returns the CRC remainder of `data_len` bits of `data` for the given
+    polynomial, using shift/XOR long division on a single register.
+    """
+    width = poly_len - 1
+    reg = data << width
+    for i in range(data_len - 1, -1, -1):
+        if (reg >> (i + width)) & 1:
+            reg ^= poly << i
+    return reg
+
+if HAVE_NUMBA:
+    @njit(uint32(uint64, uint32, int32, int32), cache=True)
+    def crc_bits(data, poly, data_len, poly_len):
+        """
+        Compiled form of _crc_bits. The XOR is masked with the leading bit
+        instead of branching on it; everything stays uint64 so Numba never
+        mixes signed and unsigned operands (which it would widen to float).
+        """
+        width = poly_len - 1
+        one = uint64(1)
+        reg = data << width
+        wide_poly = uint64(poly)
+        for i in range(data_len - 1, -1, -1):
+            bit = (reg >> (i + width)) & one
+            reg ^= (wide_poly << i) & (uint64(0) - bit)  # all ones if bit is set, else zero
+        return reg
+else:
+    crc_bits = _crc_bits
@@ -1,48 +1,158 @@
 import tkinter as tk
 from tkinter import scrolledtext, messagebox
+import functools
 import random
-import time
-import threading
+import struct
+
+from crc_kernel import crc_bits, HAVE_NUMBA, KERNEL_MAX_BITS
+
+try:
+    import crc32c
+    HAVE_CRC32C = True
+except ImportError:
+    HAVE_CRC32C = False
 
 # --- Helper Functions for Data Link Layer Simulation ---
 
-def generate_crc(data_bits, polynomial_bits):
+@functools.lru_cache(maxsize=None)
+def _crc_table(poly_int, poly_len):
     """
-    Generates a Cyclic Redundancy Check (CRC) checksum for given data.
-    This is a simplified CRC calculation for demonstration purposes.
+    Builds the 256-entry lookup table (Sarwate's algorithm) for a polynomial.
+    Entry b is the remainder of b shifted past the CRC width, so the CRC can
+    be advanced a whole byte per lookup instead of one bit at a time.
     """
-    data = [int(b) for b in data_bits]
-    polynomial = [int(b) for b in polynomial_bits]
-    n = len(polynomial)
-
-    temp_data = list(data) + [0] * (n - 1)
+    width = poly_len - 1
+    table = []
+    for byte in range(256):
+        reg = byte << width
+        for i in range(7, -1, -1):
+            if (reg >> (i + width)) & 1:
+                reg ^= poly_int << i
+        table.append(reg)
+    return tuple(table)
+
+@functools.lru_cache(maxsize=None)
+def _slice_by_4(poly_int, poly_len):
+    """
+    Builds the slicing-by-4 tables for a polynomial. Table k maps a byte to
+    its remainder when it sits k bytes above the low end of a 32-bit word, so
+    a whole word is folded into the CRC with four lookups.
+    """
+    width = poly_len - 1
+    mask = (1 << width) - 1
+    t0 = _crc_table(poly_int, poly_len)
+    tables = [t0]
+    for _ in range(3):
+        # Each table is the previous one advanced by one zero byte.
+        if width >= 8:
+            tables.append(tuple(t0[r >> (width - 8)] ^ ((r << 8) & mask) for r in tables[-1]))
+        else:
+            tables.append(tuple(t0[r << (8 - width)] for r in tables[-1]))
+    return tuple(tables)
+
+def _crc_words(data_int, data_len, tables, width):
+    """Runs the CRC 32 bits at a time through tables from _slice_by_4."""
+    t0, t1, t2, t3 = tables
+    # Leading zero bits do not change the remainder, so pad to whole words
+    # instead of finishing with a separate byte loop for the tail.
+    word_count = (data_len + 31) // 32
+    words = struct.unpack(f'>{word_count}I', data_int.to_bytes(4 * word_count, 'big'))
+
+    crc = 0
+    if width <= 32:
+        shift = 32 - width
+        for word in words:
+            v = (crc << shift) ^ word
+            crc = t3[v >> 24] ^ t2[(v >> 16) & 0xFF] ^ t1[(v >> 8) & 0xFF] ^ t0[v & 0xFF]
+    else:
+        shift = width - 32
+        mask = (1 << width) - 1
+        for word in words:
+            v = ((crc >> shift) ^ word) & 0xFFFFFFFF
+            crc = (t3[v >> 24] ^ t2[(v >> 16) & 0xFF] ^ t1[(v >> 8) & 0xFF] ^ t0[v & 0xFF]) ^ ((crc << 32) & mask)
+    return crc
 
-    for i in range(len(data)):
-        if temp_data[i] == 1:
-            for j in range(n):
-                temp_data[i + j] = temp_data[i + j] ^ polynomial[j]
+def hw_crc(payload_int, payload_len, width):
+    """
+    Returns a hardware-accelerated CRC32C of an integer payload, truncated to
+    `width` bits. Requires the optional `crc32c` package.
+    """
+    payload_bytes = payload_int.to_bytes((payload_len + 7) // 8, 'big')
+    return crc32c.crc32c(payload_bytes) & ((1 << width) - 1)
 
-    crc = "".join(str(b) for b in temp_data[len(data):])
+@functools.lru_cache(maxsize=None)
+def _make_crc_fn(polynomial_bits, use_hw_crc=False):
+    """
+    Returns a function crc(payload_int, payload_len) specialized for one
+    polynomial, with its int value, width and lookup tables bound once.
+    Every CRC in this module is computed through it: short inputs go through
+    the CRC kernel, longer ones a 32-bit word at a time through lookup tables.
+    """
+    poly_int = int(polynomial_bits, 2)
+    poly_len = len(polynomial_bits)
+    width = poly_len - 1
+
+    if use_hw_crc:
+        def crc(payload_int, payload_len):
+            return hw_crc(payload_int, payload_len, width)
+        return crc
+
+    # The kernel needs data plus CRC to fit its register and the polynomial to fit 32 bits.
+    # Without Numba it is a plain bit loop, slower than the tables, so it is not used.
+    kernel_max_len = KERNEL_MAX_BITS - width if HAVE_NUMBA and width < 32 else -1
+    tables = _slice_by_4(poly_int, poly_len)
+
+    def crc(payload_int, payload_len):
+        if payload_len <= kernel_max_len:
+            return crc_bits(payload_int, poly_int, payload_len, poly_len)
+        return _crc_words(payload_int, payload_len, tables, width)
     return crc
 
+def generate_crc(data_bits, polynomial_bits):
+    """
+    Generates a Cyclic Redundancy Check (CRC) checksum for given data.
+    This is a simplified CRC calculation for demonstration purposes.
+    """
+    crc = _make_crc_fn(polynomial_bits)(int(data_bits, 2), len(data_bits))
+    return format(crc, f'0{len(polynomial_bits) - 1}b')
+
 def check_crc(received_data_with_crc, polynomial_bits):
     """
     Checks the CRC of received data.
     Returns True if no error detected, False otherwise.
     """
-    received_bits = [int(b) for b in received_data_with_crc]
-    polynomial = [int(b) for b in polynomial_bits]
-    n = len(polynomial)
-
-    temp_received = list(received_bits)
+    width = len(polynomial_bits) - 1
+    received = int(received_data_with_crc, 2)
+    crc = _make_crc_fn(polynomial_bits)(received >> width, len(received_data_with_crc) - width)
+    return crc == received & ((1 << width) - 1)
 
-    for i in range(len(received_bits) - n + 1):
-        if temp_received[i] == 1:
-            for j in range(n):
-                temp_received[i + j] = temp_received[i + j] ^ polynomial[j]
-
-    remainder = "".join(str(b) for b in temp_received[len(received_bits) - n + 1:])
-    return int(remainder) == 0
+@functools.lru_cache(maxsize=4 * 256)
+def _framed(data, seq_num, polynomial_bits, use_hw_crc):
+    """
+    Builds the frame for `data` with a 2-bit sequence number.
+    Returns (frame_payload, crc, frame_int, frame_len). Cached, since the same
+    character is re-framed whenever it repeats with the same sequence number.
+    """
+    data_bytes = data.encode('utf-8')
+    data_int = int.from_bytes(data_bytes, 'big')
+    data_len = 8 * len(data_bytes)
+    seq_num_binary = format(seq_num, '02b')
+    data_bits = format(data_int, f'0{data_len}b')
+    frame_payload = seq_num_binary + data_bits
+    width = len(polynomial_bits) - 1
+    payload_int = (seq_num << data_len) | data_int
+    crc_int = _make_crc_fn(polynomial_bits, use_hw_crc)(payload_int, 2 + data_len)
+    crc = format(crc_int, f'0{width}b')
+    return frame_payload, crc, (payload_int << width) | crc_int, 2 + data_len + width
+
+def frame_to_str(frame):
+    """Formats a (frame_int, frame_len) frame as a bit string for display."""
+    frame_int, frame_len = frame
+    return format(frame_int, f'0{frame_len}b')
+
+# Chance that the channel corrupts a frame when bit errors are enabled (30%),
+# as a 16-bit fixed-point threshold.
+BIT_ERROR_Q = int(0.3 * 65536)
 
 # --- Data Link Layer Components ---
 
@@ -50,62 +160,86 @@ class DataLinkLayerNode:
     """
     Represents a node (Sender or Receiver) in the Data Link Layer.
     """
-    def __init__(self, name, gui_logger, polynomial="1011"):
+    def __init__(self, name, log_buf, polynomial="1011", use_hw_crc=False):
         self.name = name
         self.polynomial = polynomial
+        self._crc_width = len(polynomial) - 1
+        self.set_hw_crc(use_hw_crc)
         self.send_buffer = []
         self.next_frame_to_send = 0
         self.expected_frame_ack = 0
         self.window_size = 3
-        self.received_frames = {}
+        # Out-of-order frames, in a ring indexed by seq % (window_size + 1);
+        # bit i of _rx_mask is set while slot i holds a frame.
+        self._rx_slot = [None] * (self.window_size + 1)
+        self._rx_mask = 0
         self.next_frame_to_deliver = 0
-        self.gui_logger = gui_logger # Reference to the GUI's log area
+        self.delivered_data = "" # Everything delivered so far, in order
+        self._log_buf = log_buf # Shared with the GUI, flushed once per step
+
+    def set_hw_crc(self, enabled):
+        """
+        Switches between the polynomial CRC and the hardware CRC32C (truncated
+        to the polynomial's width). Bulk runs use the hardware CRC; stepping in
+        the GUI keeps the polynomial CRC. Ignored if `crc32c` is not installed.
+        """
+        self.use_hw_crc = enabled and HAVE_CRC32C
+        self._crc_fn = _make_crc_fn(self.polynomial, self.use_hw_crc)
+        self._crc_mode = "CRC32C" if self.use_hw_crc else self.polynomial # Shown in the framing log
 
     def log(self, message):
-        """Logs messages to the GUI's text area."""
-        self.gui_logger.insert(tk.END, f"[{self.name}] {message}\n")
-        self.gui_logger.see(tk.END) # Auto-scroll to the end
+        """Queues a message for the GUI's text area."""
+        self._log_buf.append(f"[{self.name}] {message}")
 
     def frame_data(self, data, sequence_number):
         """
         Performs framing: adds sequence number and CRC to the data.
         Frame format: [Sequence_Number (2 bits)] + [Data] + [CRC (3 bits)]
+        Returns the frame as (frame_int, frame_len).
         """
-        seq_num_binary = bin(sequence_number % 4)[2:].zfill(2)
-        data_bits = ''.join(format(ord(char), '08b') for char in data)
-        frame_payload = seq_num_binary + data_bits
-        crc = generate_crc(frame_payload, self.polynomial)
-        frame = frame_payload + crc
-        self.log(f"Framing data '{data}' (Seq:{sequence_number}) -> Payload: '{frame_payload}' -> CRC: '{crc}' -> Full Frame: '{frame}'")
-        return frame
+        frame_payload, crc, frame_int, frame_len = _framed(data, sequence_number % 4, self.polynomial, self.use_hw_crc)
+        self.log(f"Framing data '{data}' (Seq:{sequence_number}) -> Payload: '{frame_payload}' -> CRC ({self._crc_mode}): '{crc}' -> Full Frame: '{frame_payload + crc}'")
+        return frame_int, frame_len
 
     def unframe_data(self, frame):
         """
-        Extracts data and checks CRC from a received frame.
+        Extracts data and checks CRC from a received (frame_int, frame_len) frame.
         Returns (sequence_number, data, is_corrupted)
         """
-        if len(frame) < len(self.polynomial) - 1 + 2:
-            self.log(f"Received frame too short: {frame}")
+        frame_int, frame_len = frame
+        if frame_len < self._crc_width + 2:
+            self.log(f"Received frame too short: {frame_to_str(frame)}")
             return None, None, True
 
-        is_corrupted = not check_crc(frame, self.polynomial)
+        # The payload is checked and decoded straight from the frame int.
+        payload_int = frame_int >> self._crc_width
+        payload_len = frame_len - self._crc_width
+        is_corrupted = self._crc_fn(payload_int, payload_len) != frame_int & ((1 << self._crc_width) - 1)
         if is_corrupted:
-            self.log(f"CRC Check Failed for frame: {frame} -> Frame is CORRUPTED!")
+            self.log(f"CRC Check Failed for frame: {frame_to_str(frame)} -> Frame is CORRUPTED!")
             return None, None, True
 
-        seq_num_binary = frame[0:2]
-        data_bits = frame[2:-len(self.polynomial)+1]
-        
-        sequence_number = int(seq_num_binary, 2)
+        data_len = payload_len - 2
+        sequence_number = payload_int >> data_len
         data = ""
-        for i in range(0, len(data_bits), 8):
-            byte = data_bits[i:i+8]
-            if byte:
-                data += chr(int(byte, 2))
+        if data_len:
+            data_int = payload_int & ((1 << data_len) - 1)
+            data_bytes = data_int.to_bytes((data_len + 7) // 8, 'big')
+            data = data_bytes.decode('utf-8', errors='replace')
 
-        self.log(f"Unframing frame: {frame} -> Seq: {sequence_number}, Data: '{data}', CRC OK.")
+        self.log(f"Unframing frame: {frame_to_str(frame)} -> Seq: {sequence_number}, Data: '{data}', CRC OK.")
         return sequence_number, data, False
 
+    def buffered_frames(self):
+        """Returns the out-of-order frames waiting for delivery as {seq: data}."""
+        slots = len(self._rx_slot)
+        buffered = {}
+        for offset in range(slots):
+            seq = self.next_frame_to_deliver + offset
+            if self._rx_mask & (1 << (seq % slots)):
+                buffered[seq] = self._rx_slot[seq % slots]
+        return buffered
+
     def process_received_frame(self, sequence_number, data):
         """
         Processes a received frame at the receiver.
@@ -120,16 +254,24 @@ class DataLinkLayerNode:
         if sequence_number == self.next_frame_to_deliver:
             self.log(f"Frame {sequence_number} is in order. Delivering '{data}' to Network Layer.")
             self.next_frame_to_deliver += 1
+            self.delivered_data += data
             ack_to_send = sequence_number
-            while self.next_frame_to_deliver in self.received_frames:
-                buffered_data = self.received_frames.pop(self.next_frame_to_deliver)
+            idx = self.next_frame_to_deliver % len(self._rx_slot)
+            while self._rx_mask & (1 << idx):
+                buffered_data = self._rx_slot[idx]
+                self._rx_slot[idx] = None
+                self._rx_mask &= ~(1 << idx)
                 self.log(f"Delivering buffered frame {self.next_frame_to_deliver}: '{buffered_data}' to Network Layer.")
                 self.next_frame_to_deliver += 1
+                self.delivered_data += buffered_data
+                idx = self.next_frame_to_deliver % len(self._rx_slot)
             self.log(f"Sending ACK for {ack_to_send}")
             return ack_to_send
         elif sequence_number > self.next_frame_to_deliver:
             self.log(f"Frame {sequence_number} is out of order. Buffering.")
-            self.received_frames[sequence_number] = data
+            idx = sequence_number % len(self._rx_slot)
+            self._rx_slot[idx] = data
+            self._rx_mask |= 1 << idx
             ack_to_send = self.next_frame_to_deliver - 1 if self.next_frame_to_deliver > 0 else None
             if ack_to_send is not None:
                 self.log(f"Sending cumulative ACK for {ack_to_send}")
@@ -150,6 +292,11 @@ class DataLinkSimulatorGUI:
         self.simulation_data = []
         self.simulation_index = 0
         self.is_running = False
+        self._log_buf = [] # Log lines queued until the next flush_log()
+        self.rng = random.Random() # Channel loss and bit-error source
+        self._ui_pending = False # A status label refresh is scheduled
+        self._step_pending = False # A sent frame is still "on the channel"
+        self._step_after_id = None # after() callback that finishes the pending step
 
         self.create_widgets()
         self.reset_simulation()
@@ -175,6 +322,9 @@ class DataLinkSimulatorGUI:
         self.next_step_button = tk.Button(control_frame, text="Next Step", command=self.next_simulation_step, bg="#2196F3", fg="white", font=("Inter", 10, "bold"), relief="raised", bd=3, cursor="hand2", state=tk.DISABLED)
         self.next_step_button.grid(row=0, column=3, padx=10, pady=5)
 
+        self.run_all_button = tk.Button(control_frame, text="Run All", command=self.run_all, bg="#2196F3", fg="white", font=("Inter", 10, "bold"), relief="raised", bd=3, cursor="hand2", state=tk.DISABLED)
+        self.run_all_button.grid(row=1, column=4, padx=10, pady=5)
+
         self.reset_button = tk.Button(control_frame, text="Reset", command=self.reset_simulation, bg="#f44336", fg="white", font=("Inter", 10, "bold"), relief="raised", bd=3, cursor="hand2")
         self.reset_button.grid(row=0, column=4, padx=10, pady=5)
 
@@ -213,6 +363,17 @@ class DataLinkSimulatorGUI:
         self.receiver_delivered_label = tk.Label(status_frame, text="Delivered Data: ''", font=("Inter", 10), bg="#c8e6c9")
         self.receiver_delivered_label.pack(anchor="w")
 
+        # Text templates for the status labels, filled in by update_status_labels
+        self._label_templates = {
+            self.sender_buffer_label: "Buffer: {}",
+            self.sender_seq_label: "Next Frame to Send: {}",
+            self.sender_ack_label: "Expected ACK: {}",
+            self.receiver_expected_label: "Expected Frame to Deliver: {}",
+            self.receiver_buffered_label: "Buffered Frames: {}",
+            self.receiver_delivered_label: "Delivered Data: '{}'",
+        }
+        self._label_text = {} # Last text set on each status label
+
 
         # Log Area
         log_frame = tk.LabelFrame(self.master, text="Simulation Log", font=("Inter", 12, "bold"), bg="#bbdefb", fg="#1a237e", bd=2, relief="groove", padx=5, pady=5)
@@ -223,45 +384,67 @@ class DataLinkSimulatorGUI:
         self.log_text.config(state=tk.DISABLED) # Make it read-only
 
     def update_status_labels(self):
+        """
+        Schedules a refresh of the sender and receiver status labels.
+        Repeated calls before Tk goes idle are coalesced into one refresh.
+        """
+        if self._ui_pending:
+            return
+        self._ui_pending = True
+        self.master.after_idle(self._flush_ui)
+
+    def _flush_ui(self):
         """Updates the sender and receiver status labels in the GUI."""
+        self._ui_pending = False
         if self.sender:
-            self.sender_buffer_label.config(text=f"Buffer: {self.sender.send_buffer}")
-            self.sender_seq_label.config(text=f"Next Frame to Send: {self.sender.next_frame_to_send}")
-            self.sender_ack_label.config(text=f"Expected ACK: {self.sender.expected_frame_ack}")
+            self._set_status_label(self.sender_buffer_label, self.sender.send_buffer)
+            self._set_status_label(self.sender_seq_label, self.sender.next_frame_to_send)
+            self._set_status_label(self.sender_ack_label, self.sender.expected_frame_ack)
         if self.receiver:
-            self.receiver_expected_label.config(text=f"Expected Frame to Deliver: {self.receiver.next_frame_to_deliver}")
-            self.receiver_buffered_label.config(text=f"Buffered Frames: {self.receiver.received_frames}")
-            # Accumulate delivered data for display
-            delivered_data_str = "".join(self.simulation_data[:self.receiver.next_frame_to_deliver])
-            self.receiver_delivered_label.config(text=f"Delivered Data: '{delivered_data_str}'")
+            self._set_status_label(self.receiver_expected_label, self.receiver.next_frame_to_deliver)
+            self._set_status_label(self.receiver_buffered_label, self.receiver.buffered_frames())
+            self._set_status_label(self.receiver_delivered_label, self.receiver.delivered_data)
+
+    def _set_status_label(self, label, value):
+        """Fills in a status label's template, skipping the Tk call if the text is unchanged."""
+        text = self._label_templates[label].format(value)
+        if self._label_text.get(label) != text:
+            label.config(text=text)
+            self._label_text[label] = text
 
     def log_channel_message(self, message):
-        """Logs channel messages to the GUI's text area."""
+        """Queues a channel message for the GUI's text area."""
+        self._log_buf.append(f"  [Channel] {message}")
+
+    def flush_log(self):
+        """Writes all queued log lines to the log area in a single insert."""
+        if not self._log_buf:
+            return
         self.log_text.config(state=tk.NORMAL)
-        self.log_text.insert(tk.END, f"  [Channel] {message}\n")
-        self.log_text.see(tk.END)
+        self.log_text.insert(tk.END, "\n".join(self._log_buf) + "\n")
+        self.log_text.see(tk.END) # Auto-scroll to the end
         self.log_text.config(state=tk.DISABLED)
+        self._log_buf.clear()
 
     def simulate_channel_gui(self, frame, introduce_error_flag, loss_prob):
         """
         Simulates a noisy communication channel, updating GUI.
+        Takes and returns frames as (frame_int, frame_len).
         """
-        self.log_channel_message(f"Sending frame: {frame}")
-        time.sleep(0.5) # Simulate transmission delay
+        self.log_channel_message(f"Sending frame: {frame_to_str(frame)}")
 
-        if random.random() < loss_prob:
+        # Probabilities are compared as 16-bit fixed point against getrandbits(16)
+        if self.rng.getrandbits(16) < int(loss_prob * 65536):
             self.log_channel_message("!!! Frame lost in transit !!!")
             return None
 
-        if introduce_error_flag and random.random() < 0.3:
-            error_index = random.randint(0, len(frame) - 1)
-            original_char = frame[error_index]
-            corrupted_char = '1' if original_char == '0' else '0'
-            corrupted_frame = list(frame)
-            corrupted_frame[error_index] = corrupted_char
-            corrupted_frame_str = "".join(corrupted_frame)
-            self.log_channel_message(f"!!! Bit error introduced at index {error_index} (changed {original_char} to {corrupted_char}) !!!")
-            return corrupted_frame_str
+        if introduce_error_flag and self.rng.getrandbits(16) < BIT_ERROR_Q:
+            frame_int, frame_len = frame
+            error_index = self.rng.randrange(frame_len)
+            bit_mask = 1 << (frame_len - 1 - error_index) # Index 0 is the leftmost bit
+            original_bit = 1 if frame_int & bit_mask else 0
+            self.log_channel_message(f"!!! Bit error introduced at index {error_index} (changed {original_bit} to {original_bit ^ 1}) !!!")
+            return frame_int ^ bit_mask, frame_len
         return frame
 
     def start_simulation(self):
@@ -285,14 +468,16 @@ class DataLinkSimulatorGUI:
         self.log_text.delete(1.0, tk.END)
         self.log_text.config(state=tk.DISABLED)
 
-        self.sender = DataLinkLayerNode("Sender", self.log_text)
-        self.receiver = DataLinkLayerNode("Receiver", self.log_text)
+        self._log_buf.clear()
+        self.sender = DataLinkLayerNode("Sender", self._log_buf)
+        self.receiver = DataLinkLayerNode("Receiver", self._log_buf)
         self.simulation_data = list(data_input) # Convert string to list of characters
         self.simulation_index = 0
         self.is_running = True
 
         self.start_button.config(state=tk.DISABLED)
         self.next_step_button.config(state=tk.NORMAL)
+        self.run_all_button.config(state=tk.NORMAL)
         self.data_entry.config(state=tk.DISABLED)
         self.introduce_error_checkbox.config(state=tk.DISABLED)
         self.loss_probability_entry.config(state=tk.DISABLED)
@@ -300,17 +485,71 @@ class DataLinkSimulatorGUI:
         self.sender.send_buffer.extend(self.simulation_data)
         self.sender.log(f"Sender ready to send data. Buffer: {self.sender.send_buffer}")
         self.update_status_labels()
-        self.log_text.config(state=tk.NORMAL)
-        self.log_text.insert(tk.END, "\n--- Simulation Started ---\n")
-        self.log_text.config(state=tk.DISABLED)
+        self._log_buf.append("\n--- Simulation Started ---")
+        self.flush_log()
 
     def next_simulation_step(self):
-        if not self.is_running:
+        if not self.is_running or self._step_pending:
+            return
+
+        introduce_error_flag = self.introduce_error_var.get()
+        loss_prob = float(self.loss_probability_entry.get())
+
+        status = self._process_one_frame(introduce_error_flag, loss_prob)
+        if status == "sent":
+            # Show the step once the frame has spent its time on the channel.
+            self._step_pending = True
+            self.next_step_button.config(state=tk.DISABLED)
+            self.run_all_button.config(state=tk.DISABLED)
+            self._step_after_id = self.master.after(500, self._finish_step, status)
+        else:
+            self._finish_step(status)
+
+    def run_all(self):
+        """
+        Runs the rest of the simulation in one go, with no channel delay and no
+        GUI updates until the end. Stops once the sender is waiting for ACKs,
+        since lost or corrupted frames are never retransmitted. Both nodes use
+        the hardware CRC (when available) for the duration of the run.
+        """
+        if not self.is_running or self._step_pending:
             return
 
         introduce_error_flag = self.introduce_error_var.get()
         loss_prob = float(self.loss_probability_entry.get())
 
+        self.sender.set_hw_crc(True)
+        self.receiver.set_hw_crc(True)
+        try:
+            status = "sent"
+            while status == "sent":
+                status = self._process_one_frame(introduce_error_flag, loss_prob)
+        finally:
+            # Stepping must go back to the polynomial CRC even if the run fails
+            self.sender.set_hw_crc(False)
+            self.receiver.set_hw_crc(False)
+        self._finish_step(status)
+
+    def _finish_step(self, status):
+        """Shows the result of a step: flushes the log and refreshes the status labels."""
+        self._step_pending = False
+        self._step_after_id = None
+        if not self.is_running:
+            return
+        if status == "done":
+            self.end_simulation()
+        else:
+            self.next_step_button.config(state=tk.NORMAL)
+            self.run_all_button.config(state=tk.NORMAL)
+        self.update_status_labels()
+        self.flush_log()
+
+    def _process_one_frame(self, introduce_error_flag, loss_prob):
+        """
+        Runs one step of the sliding-window protocol without touching Tk; log
+        lines only go to the log buffer. Returns "sent" if a frame was sent,
+        "waiting" if the window is full, or "done" once everything is ACKed.
+        """
         # Check if there are frames left to send or ACKs to receive
         if self.sender.next_frame_to_send < len(self.sender.send_buffer) or \
            self.sender.expected_frame_ack < len(self.sender.send_buffer):
@@ -345,40 +584,41 @@ class DataLinkSimulatorGUI:
                     # For simplicity, we'll just stop sending new frames and wait for next step
 
                 self.sender.next_frame_to_send += 1
-                self.update_status_labels()
+                return "sent"
 
             else:
                 # No more new frames to send within the window, or all data sent
                 if self.sender.expected_frame_ack < len(self.sender.send_buffer):
                     self.sender.log(f"Waiting for ACKs. Window: [{self.sender.expected_frame_ack}, {self.sender.expected_frame_ack + self.sender.window_size - 1}]")
                     # In a real protocol, a timeout would retransmit unacknowledged frames
-                else:
-                    self.sender.log(f"All data sent and acknowledged.")
-                    self.end_simulation()
-        else:
-            self.sender.log(f"All data sent and acknowledged.")
-            self.end_simulation()
+                    return "waiting"
 
-        self.update_status_labels()
+        self.sender.log(f"All data sent and acknowledged.")
+        return "done"
 
 
     def end_simulation(self):
         self.is_running = False
-        self.log_text.config(state=tk.NORMAL)
-        self.log_text.insert(tk.END, "\n--- Simulation Finished ---\n")
-        self.log_text.config(state=tk.DISABLED)
+        self._log_buf.append("\n--- Simulation Finished ---")
+        self.flush_log()
         self.start_button.config(state=tk.DISABLED)
         self.next_step_button.config(state=tk.DISABLED)
+        self.run_all_button.config(state=tk.DISABLED)
         messagebox.showinfo("Simulation Complete", "All data has been sent and acknowledged.")
 
 
     def reset_simulation(self):
         self.is_running = False
+        if self._step_after_id is not None:
+            self.master.after_cancel(self._step_after_id) # Drop the step still on the channel
+            self._step_after_id = None
+        self._step_pending = False
         self.sender = None
         self.receiver = None
         self.simulation_data = []
         self.simulation_index = 0
 
+        self._log_buf.clear()
         self.log_text.config(state=tk.NORMAL)
         self.log_text.delete(1.0, tk.END)
         self.log_text.insert(tk.END, "Simulation ready. Enter data and click 'Start Simulation'.\n")
@@ -394,6 +634,7 @@ class DataLinkSimulatorGUI:
 
         self.start_button.config(state=tk.NORMAL)
         self.next_step_button.config(state=tk.DISABLED)
+        self.run_all_button.config(state=tk.DISABLED)
         self.update_status_labels() # Clear status labels
 
 def main():
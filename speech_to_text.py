@@ -1,10 +1,22 @@
+import asyncio
 import speech_recognition as sr
 
+_RECOGNIZER = sr.Recognizer()
+
+def _transcribe_sync(audio_file):
+    with sr.AudioFile(audio_file) as source:
+        audio = _RECOGNIZER.record(source)
+    return _RECOGNIZER.recognize_google(audio)
+
 def transcribe_audio_file(audio_file):
-    recognizer = sr.Recognizer()
     try:
-        with sr.AudioFile(audio_file) as source:
-            audio = recognizer.record(source)
-        return recognizer.recognize_google(audio)
+        return _transcribe_sync(audio_file)
+    except Exception as e:
+        return f"Error transcribing audio: {str(e)}"
+
+async def transcribe_audio_file_async(audio_file):
+    # The Google request runs in a worker thread so the event loop can serve others meanwhile
+    try:
+        return await asyncio.to_thread(_transcribe_sync, audio_file)
     except Exception as e:
         return f"Error transcribing audio: {str(e)}"